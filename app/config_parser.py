@@ -1,11 +1,9 @@
 import configparser
+import functools
 from pathlib import PosixPath
 
-def read_config(configfile: str | PosixPath) -> dict | configparser.ConfigParser:
-    '''
-    read_config(configfile)
-    Reads .ini configuration file in configfile and outputs the configuration parameters stated in the file.
-    '''
+@functools.cache
+def _parse_config(configfile: str | PosixPath) -> dict:
     config = configparser.ConfigParser(
         converters={
             'csv': lambda x: [el.strip().strip('\'') for el in x.split(',')], # read list of comma separated values
@@ -18,7 +16,15 @@ def read_config(configfile: str | PosixPath) -> dict | configparser.ConfigParser
     params['output_dir'] = config.get('Paths', 'output_dir', fallback='./')
     params['gdb_bld_path'] = config.get('Paths', 'gdb_bld_path', fallback='./')
 
-    
-    # root_folder = config['Paths']['root_folder']  
+
+    # root_folder = config['Paths']['root_folder']
 
     return params
+
+def read_config(configfile: str | PosixPath) -> dict | configparser.ConfigParser:
+    '''
+    read_config(configfile)
+    Reads .ini configuration file in configfile and outputs the configuration parameters stated in the file.
+    The file is parsed once per process; later calls return a copy of the cached parameters.
+    '''
+    return dict(_parse_config(configfile))
@@ -1,21 +1,25 @@
-import warnings
-import geopandas
-import libpysal
-import momepy
-import osmnx
+from __future__ import annotations
+
 import pandas as pd
-import configparser
 import os
 from clustergram import Clustergram
 import matplotlib.pyplot as plt
-from bokeh.plotting import show
 import matplotlib.patches as mpatches
 import streamlit as st
 from kneed import KneeLocator
-from sklearn.cluster import KMeans
-import geopandas as gpd
-from collections import Counter
-import contextily as ctx
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.mixture import GaussianMixture
+from sklearn.metrics import davies_bouldin_score
+from scipy.cluster.hierarchy import linkage, fcluster
+from plot_funcs import add_cached_basemap
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+
+# size the joblib (loky) worker pool from the logical core count instead of probing physical cores on every sweep
+os.environ.setdefault('LOKY_MAX_CPU_COUNT', str(os.cpu_count()))
 
 
 def _elbow(gdf, K: range):
@@ -68,9 +72,41 @@ def get_cluster(gdf: gpd.GeoDataFrame, model='kmeans', standardize=False, min_cl
     return cgram
 
 
+def _make_model(model, k, n_init=13, random_state=42):
+    """
+    :param model: model to use for clustering ['kmeans', 'gmm', 'minibatchkmeans']
+    :param k: number of clusters
+    :return: unfitted sklearn estimator matching the Clustergram method of the same name
+    """
+    if model == 'kmeans':
+        return KMeans(n_clusters=k, n_init=n_init, random_state=random_state)
+    if model == 'minibatchkmeans':
+        return MiniBatchKMeans(n_clusters=k, n_init=n_init, random_state=random_state)
+    if model == 'gmm':
+        return GaussianMixture(n_components=k, n_init=n_init, random_state=random_state)
+    raise ValueError(f"Unknown clustering model: {model}")
+
+
+def _hierarchical_labels(data, ks):
+    """
+    :param data: array to cluster
+    :param ks: numbers of clusters to cut the tree at
+    :return: dict of k -> labels (0..k-1), reproducing Clustergram's 'hierarchical' method: one single linkage
+    tree, cut at its k-th largest merge distance
+    """
+    Z = linkage(data, method='single')
+    distances = Z[:, 2][Z[:, 2] > 0][::-1]
+    return {k: fcluster(Z, distances[k - 1], criterion='distance') - 1 for k in ks}
+
+
+def _fit_one(data, model, k, n_init, random_state):
+    labels = _make_model(model, k, n_init, random_state).fit_predict(data)
+    return k, davies_bouldin_score(data, labels)
+
+
 def best_davies_bouldin_score(gdf: gpd.GeoDataFrame, model='kmeans', standardize=True, min_clusters=1,
                      max_clusters=15,
-                     n_init=13, random_state=42,repeat=5):
+                     n_init=13, random_state=42,repeat=5, X_arr=None):
     """
     :param gdf: dataFrame to cluster
     :param model: model to use for clustering ['kmeans', 'gmm', 'minibatchkmeans', 'hierarchical']
@@ -80,13 +116,33 @@ def best_davies_bouldin_score(gdf: gpd.GeoDataFrame, model='kmeans', standardize
     :param n_init: number of times to run the clustering
     :param random_state: random state for k means clustering
     :param repeat: number of times to calculate the davies bouldin score over different runs
+    :param X_arr: optional precomputed contiguous array of gdf (already standardized, NaN-free), used instead of gdf
     :return: sorted list of the best number of clusters based on the davies bouldin score
     """
+    if X_arr is not None:
+        data = X_arr
+    else:
+        if standardize:
+            gdf = (gdf - gdf.mean()) / gdf.std()
+        data = gdf.fillna(0).to_numpy()
     K = range(min_clusters, max_clusters)
     best_scores = {k:0 for k in K}
+    # the davies bouldin score is undefined for a single cluster
+    scored_K = [k for k in K if k > 1]
+    if model == 'hierarchical':
+        # hierarchical clustering is deterministic: build the tree once and cut it for every k
+        repeat = 1
+        fits = [(k, davies_bouldin_score(data, labels)) for k, labels in _hierarchical_labels(data, scored_K).items()]
+    else:
+        if random_state is not None:
+            # a fixed seed gives identical fits on every repeat, and so the same ranking
+            repeat = 1
+        # every (repeat, k) fit is independent, so run them all across the available cores
+        fits = Parallel(n_jobs=-1, backend='loky')(
+            delayed(_fit_one)(data, model, k, n_init, random_state) for _ in range(repeat) for k in scored_K
+        )
     for i in range(repeat):
-        cgram = get_cluster(gdf, model, standardize, min_clusters, max_clusters, n_init, random_state)
-        davis_bouldin = cgram.davies_bouldin_score().iloc[:-1]
+        davis_bouldin = pd.Series(dict(fits[i * len(scored_K):(i + 1) * len(scored_K)]))
         l = 0
         for index, value in davis_bouldin.sort_values(ascending=False).items():
             best_scores[index] += l
@@ -134,9 +190,16 @@ def plot_num_of_clusters(gdf: gpd.GeoDataFrame, model='kmeans', standardize=True
 
     return fig,axes
 
-def add_cluster_col(merged, buildings, standardized, clusters_num, model):
-    cgram = get_cluster(standardized, model, standardize=False, min_clusters=clusters_num, max_clusters=clusters_num+1, n_init=10, random_state=None)
-    merged["cluster"] = cgram.labels[clusters_num].values
+def add_cluster_col(merged, buildings, standardized, clusters_num, model, X_arr=None):
+    if X_arr is not None:
+        # fit straight on the precomputed array, skipping the per-fit pandas -> numpy conversion
+        if model == 'hierarchical':
+            merged["cluster"] = _hierarchical_labels(X_arr, [clusters_num])[clusters_num]
+        else:
+            merged["cluster"] = _make_model(model, clusters_num, n_init=10, random_state=None).fit_predict(X_arr)
+    else:
+        cgram = get_cluster(standardized, model, standardize=False, min_clusters=clusters_num, max_clusters=clusters_num+1, n_init=10, random_state=None)
+        merged["cluster"] = cgram.labels[clusters_num].values
     buildings["cluster"] = merged["cluster"]
     return buildings ,merged
 
@@ -193,7 +256,7 @@ def plot_clusters_st(buildings):
     legend_handles = [mpatches.Patch(color=color_map[cluster], label=f'Cluster {cluster}') 
                       for cluster in unique_clusters]
 
-    ctx.add_basemap(ax, crs=buildings.crs, source=ctx.providers.CartoDB.Positron)
+    add_cached_basemap(ax, buildings.crs)
 
     # Add the custom legend
     ax.legend(handles=legend_handles, title='Cluster', bbox_to_anchor=(1, 1), loc='upper left')
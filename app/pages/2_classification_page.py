@@ -1,17 +1,27 @@
 import streamlit as st
 from generate_clusters import add_cluster_col, plot_clusters_st, best_davies_bouldin_score, plot_num_of_clusters
 import pandas as pd
+import numpy as np
 import os
+import io
+import logging
+import gc
+import csv
+import shutil
 import zipfile
 import tempfile
-import geopandas as gpd
+import uuid
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
 st.set_page_config(layout="wide", page_title='ClusterOn')
 
+logger = logging.getLogger(__name__)
+
 ######################### Session state initialization #########################
 # Initialize session state variables
 def init_session_state():
-    session_keys = ['rec_list', 'merged', 'standardized', 'buildings', 'urban_types', 'cluster_fig', 'cluster_merged']
+    session_keys = ['rec_list', 'merged', 'standardized', 'standardized_np', 'standardized_version', 'buildings', 'urban_types', 'cluster_fig', 'cluster_merged']
     for key in session_keys:
         if key not in st.session_state:
             st.session_state[key] = None
@@ -20,66 +30,167 @@ init_session_state()
 
 ######################### Helper functions #########################
 
-@st.cache_data
-def convert_df(_df):
-    return _df.to_csv().encode("utf-8")
+# standardized.csv only holds standardized metric columns, so every column is parsed as float32
+CSV_SCHEMA = {
+    "standardized.csv": pa.float32(),
+}
+
+EXPECTED_FILES = ["merged.gpkg", "standardized.csv", "buildings.gpkg"]
+MAX_MEMBER_SIZE = 4 * 1024 ** 3  # ZIP members larger than this (in bytes) are skipped
+CSV_STREAMING_THRESHOLD = 100 * 1024 * 1024  # CSVs larger than this (in bytes) are parsed in chunks
+CSV_CHUNKSIZE = 200_000
+
+def _read_csv_streaming(fh, dtype, chunksize=CSV_CHUNKSIZE):
+    # Parse in row chunks, so the parser's temporary buffers never cover the whole file
+    parts = list(pd.read_csv(fh, chunksize=chunksize, dtype=dtype))
+    return pd.concat(parts, ignore_index=True, copy=False)
+
+def _read_csv(zip_ref, info):
+    name = info.filename
+    if info.file_size > CSV_STREAMING_THRESHOLD:
+        with zip_ref.open(name) as fh:
+            return _read_csv_streaming(fh, CSV_SCHEMA[name].to_pandas_dtype())
+    with zip_ref.open(name) as fh:
+        header = next(csv.reader(io.TextIOWrapper(fh, encoding="utf-8")))
+    column_types = {column: CSV_SCHEMA[name] for column in header}
+    with zip_ref.open(name) as fh:
+        table = pa_csv.read_csv(fh, convert_options=pa_csv.ConvertOptions(column_types=column_types))
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+def _read_member(zip_ref, info):
+    name = info.filename
+    if name.endswith(".csv"):
+        # CSV_SCHEMA already parses the standardized metrics as float32, halving the data handed to the clustering models
+        df = _read_csv(zip_ref, info)
+    else:
+        import geopandas as gpd
+        with zip_ref.open(name) as fh:
+            df = gpd.read_file(fh)
+    if logger.isEnabledFor(logging.DEBUG):
+        # deep=True walks every object and geometry value, so only measure when the message is emitted
+        logger.debug("Loaded %s: %d bytes", name, df.memory_usage(deep=True).sum())
+    return df
+
+@st.cache_data(persist=None, max_entries=1)  # only the latest upload is kept; each entry holds every decoded file
+def _load_zip(file_id: str, _uploaded_zip, max_member_size: int = MAX_MEMBER_SIZE) -> dict[str, pd.DataFrame]:
+    # Spill the upload to disk and decode one member at a time, so only a single inflated file is held in memory
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
+    zip_path = tmp.name
+
+    dfs = {}
+    try:
+        with tmp:
+            _uploaded_zip.seek(0)
+            shutil.copyfileobj(_uploaded_zip, tmp, length=1 << 20)
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                if info.filename not in EXPECTED_FILES or info.file_size > max_member_size:
+                    continue
+                dfs[os.path.splitext(info.filename)[0]] = _read_member(zip_ref, info)
+                gc.collect()
+    finally:
+        os.remove(zip_path)
+    if 'standardized' in dfs:
+        dfs['standardized_np'] = _to_array(dfs['standardized'])
+    return dfs
+
+def _to_array(standardized):
+    # contiguous float32 matrix handed to the clustering models, so they don't convert the DataFrame on every fit
+    return np.ascontiguousarray(standardized.select_dtypes('number').fillna(0).to_numpy(np.float32))
+
+def _derived(key, build):
+    # Page-private view of the shared 'standardized' DataFrame, rebuilt whenever it has been replaced
+    # (e.g. Part 1 reran, or only the frame came over)
+    source = st.session_state['standardized']
+    if st.session_state.get(key) is None or st.session_state.get(f'{key}_source') is not source:
+        st.session_state[key] = build(source)
+        st.session_state[f'{key}_source'] = source
+    return st.session_state[key]
+
+def _standardized_array():
+    return _derived('standardized_np', _to_array)
+
+def _standardized_version():
+    # Cheap but exact cache key for the clustering helpers: a new token whenever 'standardized' is replaced
+    # (a ZIP upload sets its file_id instead, so reruns re-reading the same upload keep hitting the cache)
+    return _derived('standardized_version', lambda standardized: uuid.uuid4().hex)
+
+
+@st.cache_data(persist=None)
+def convert_df(df):
+    # pyarrow's CSV writer runs in C, unlike DataFrame.to_csv
+    buf = io.BytesIO()
+    pa_csv.write_csv(pa.Table.from_pandas(df), buf)
+    return buf.getvalue()
+
+@st.cache_data(persist=None)
+def convert_df_parquet(df):
+    buf = io.BytesIO()
+    df.to_parquet(buf, engine='pyarrow', compression='snappy')
+    return buf.getvalue()
 
 def process_uploaded_zip(uploaded_zip):
     try:
-        with zipfile.ZipFile(uploaded_zip, 'r') as zip_ref:
-            expected_files = ["merged.gpkg", "standardized.csv", "buildings.gpkg"]
-            zip_file_names = zip_ref.namelist()
-            missing_files = [file for file in expected_files if file not in zip_file_names]
-
-            if missing_files:
-                st.error(f"Missing files in the ZIP: {', '.join(missing_files)}")
-            else:
-                merged_df = gpd.read_file(zip_ref.open("merged.gpkg"))
-                standardized_df = pd.read_csv(zip_ref.open("standardized.csv"))
-                buildings_df = gpd.read_file(zip_ref.open("buildings.gpkg"))
-
-                st.session_state['merged'] = merged_df
-                st.session_state['standardized'] = standardized_df
-                st.session_state['buildings'] = buildings_df
-
-                st.sidebar.success("All files extracted and loaded successfully!")
+        dfs = _load_zip(uploaded_zip.file_id, uploaded_zip)
+        missing_files = [file for file in EXPECTED_FILES if os.path.splitext(file)[0] not in dfs]
+
+        if missing_files:
+            st.error(f"Missing or oversized files in the ZIP: {', '.join(missing_files)}")
+        else:
+            for key, df in dfs.items():
+                st.session_state[key] = df
+            st.session_state['standardized_version'] = uploaded_zip.file_id
+            for key in ('standardized_np', 'standardized_version'):
+                st.session_state[f'{key}_source'] = st.session_state['standardized']
+
+            st.sidebar.success("All files extracted and loaded successfully!")
     except Exception as e:
         st.sidebar.error(f"An error occurred while processing the ZIP file: {e}")
 
+@st.cache_data(show_spinner=False, persist=None, max_entries=16)
+def _recommend(standardized_version: str, _X_arr, model, min_clusters, max_clusters, n_init, random_state, repeat):
+    # standardized_version identifies the data in the cache key; _X_arr is the matching array and is left out of it
+    return best_davies_bouldin_score(
+        None,
+        model=model,
+        standardize=False,
+        min_clusters=min_clusters,
+        max_clusters=max_clusters,
+        n_init=n_init,
+        random_state=random_state,
+        repeat=repeat,
+        X_arr=_X_arr
+    )
+
+@st.cache_data(show_spinner=False, persist=None, max_entries=16)
+def _cluster_plots(standardized_version: str, _standardized: pd.DataFrame, model, min_clusters, max_clusters, n_init, random_state):
+    cluster_fig, axes = plot_num_of_clusters(
+        _standardized,
+        model=model,
+        standardize=False,
+        min_clusters=min_clusters,
+        max_clusters=max_clusters,
+        n_init=n_init,
+        random_state=random_state,
+    )
+    return cluster_fig
+
 def recommend_clusters(max_clusters):
     if 'standardized' in st.session_state:
-        rec_list = best_davies_bouldin_score(
-            st.session_state.get('standardized'),
-            model=st.session_state['cluster_model'], 
-            standardize=False, 
-            min_clusters=1, 
-            max_clusters=max_clusters,
-            n_init=13, 
-            random_state=None,
-            repeat=5
-        )
+        rec_list = _recommend(_standardized_version(), _standardized_array(), st.session_state['cluster_model'], 1, max_clusters, 13, None, 5)
         st.session_state.rec_list = rec_list
 
 def show_cluster_plots():
     if 'standardized' in st.session_state:
-        cluster_fig, axes = plot_num_of_clusters(
-            st.session_state.get('standardized'), 
-            model=st.session_state['cluster_model'], 
-            standardize=False, 
-            min_clusters=1,
-            max_clusters=15,
-            n_init=13, 
-            random_state=None,
-        )
-        st.session_state.cluster_fig = cluster_fig
+        st.session_state.cluster_fig = _cluster_plots(_standardized_version(), st.session_state['standardized'], st.session_state['cluster_model'], 1, 15, 13, None)
 
 def run_classification(clusters_num, model):
-    if all(key in st.session_state and not st.session_state[key].empty for key in ['merged', 'standardized', 'buildings']):
+    if all(st.session_state.get(key) is not None and len(st.session_state[key]) for key in ['merged', 'standardized', 'buildings']):
         merged = st.session_state['merged']
         standardized = st.session_state['standardized']
         buildings = st.session_state['buildings']
 
-        urban_types, cluster_merged = add_cluster_col(merged, buildings, standardized, clusters_num, model)
+        urban_types, cluster_merged = add_cluster_col(merged, buildings, standardized, clusters_num, model, X_arr=_standardized_array())
         st.session_state['urban_types'] = urban_types
         st.session_state['cluster_merged'] = cluster_merged
 
@@ -127,6 +238,29 @@ def save_output_files():
                     )
             except Exception as e:
                 st.error(f"An error occurred while saving: {e}")
+
+            cluster_table = pd.DataFrame(cluster_merged.drop(columns=cluster_merged.geometry.name))
+            csv_col, parquet_col = st.columns(2)
+            with csv_col:
+                try:
+                    st.download_button(
+                        label='Download clusters table as .csv',
+                        data=convert_df(cluster_table),
+                        file_name='clusters.csv',
+                        mime='text/csv'
+                    )
+                except Exception as e:
+                    st.error(f"An error occurred while converting the clusters table to CSV: {e}")
+            with parquet_col:
+                try:
+                    st.download_button(
+                        label='Download Parquet',
+                        data=convert_df_parquet(cluster_table),
+                        file_name='clusters.parquet',
+                        mime='application/octet-stream'
+                    )
+                except Exception as e:
+                    st.error(f"An error occurred while converting the clusters table to Parquet: {e}")
     else:
         st.warning("Please upload files first, then run the preprocess.")
 
@@ -1,77 +1,126 @@
+import io
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import matplotlib.colors as mcolors
 import streamlit as st
-import seaborn as sns
 import matplotlib.patches as mpatches
-import contextily as ctx
-import geopandas as gpd
+
+
+def _stack_by_index(series_list):
+    """
+    Align per-cluster Series on their combined index (in order of first appearance) and stack them
+    as the columns of one contiguous float32 matrix, so cross-cluster aggregations run in NumPy.
+    Labels missing from a cluster become NaN.
+    """
+    index = pd.Index(dict.fromkeys(label for series in series_list for label in series.index))
+    matrix = np.column_stack(
+        [series.reindex(index).to_numpy(np.float32) for series in series_list]
+    )
+    return index, matrix
 
 
 def plot_outliers(gdf, results, classification_column):
     """
     Function to plot the outliers from all clusters in different colors.
     """
+    import geopandas as gpd
+
     fig, ax = plt.subplots(figsize=(10, 6))
 
     # Plot the base map (all buildings/streets)
-    gdf.plot(ax=ax, color="lightgrey", label="All elements")
+    gdf.plot(ax=ax, color="lightgrey")
 
-    # Collect all outliers from each cluster and plot them
+    # Collect all outliers from each cluster into one GeoDataFrame and plot them in a single pass
     cmap = plt.get_cmap("tab10")  # Use a colormap for distinct colors
-    cluster_colors = {}
-
-    for i, cluster in enumerate(results.keys()):
-        cluster_outliers = results[cluster]["outliers"]
-        if cluster_outliers.empty:
-            continue  # Skip clusters with no outliers
-        cluster_outliers.plot(
-            ax=ax, marker="o", color=cmap(i), label=f"Cluster {cluster} Outliers"
+    clusters = [
+        cluster for cluster in results.keys() if not results[cluster]["outliers"].empty
+    ]  # Skip clusters with no outliers
+    cluster_colors = {
+        cluster: cmap(i)
+        for i, cluster in enumerate(results.keys())
+        if cluster in clusters
+    }
+
+    if clusters:
+        all_outliers = gpd.GeoDataFrame(
+            pd.concat(
+                [results[cluster]["outliers"].assign(cluster=cluster) for cluster in clusters],
+                ignore_index=True,
+            )
+        )
+        all_outliers.plot(
+            ax=ax,
+            column="cluster",
+            categorical=True,
+            categories=clusters,
+            cmap=mcolors.ListedColormap([cluster_colors[cluster] for cluster in clusters]),
+            marker="o",
+            legend=True,
+            legend_kwds={"title": "Cluster Outliers"},
         )
-        cluster_colors[cluster] = cmap(i)  # Store color for future use
 
     plt.title("Outliers for All Clusters")
-    plt.legend()
     plt.tight_layout()
     plt.show()
 
 
-def plot_flexibility_scores_table(results):
+FLEXIBILITY_TABLE_HEADERS = [
+    "Cluster",
+    "Top 5 Flexible Metrics",
+    "Top 5 Flexibility Scores",
+    "Bottom 5 Strict Metrics",
+    "Bottom 5 Strict Scores",
+]
+
+
+def _flex_long(results):
     """
-    Function to plot a table showing the top 5 and bottom 5 flexibility scores for each cluster,
-    with separate columns for the metric names and values, and a title above the table.
+    Long table with one (cluster, metric, score) row per flexibility score of every cluster.
     """
-    # Prepare data for the table
-    table_data = []
-    # Iterate over each cluster's results
-    for cluster, result in results.items():
-        flexibility_score = result["flexibility_score"]
-
-        # Get the top 5 and bottom 5 metrics by flexibility score
-        top_5_metrics = flexibility_score.nlargest(5)
-        bottom_5_metrics = flexibility_score.nsmallest(5)
-
-        # Add top 5 and bottom 5 metrics as separate columns for metric names and values
-        top_5_metrics_names = "\n".join(top_5_metrics.index)
-        top_5_metrics_values = "\n".join(
-            [f"{score:.2f}" for score in top_5_metrics.values]
-        )
-        bottom_5_metrics_names = "\n".join(bottom_5_metrics.index)
-        bottom_5_metrics_values = "\n".join(
-            [f"{score:.2f}" for score in bottom_5_metrics.values]
-        )
+    parts = [
+        result["flexibility_score"]
+        .rename("score")
+        .rename_axis("metric")
+        .reset_index()
+        .assign(cluster=cluster)
+        for cluster, result in results.items()
+    ]
+    return pd.concat(parts, ignore_index=True)
+
 
-        # Add the data to the table
+def _flexibility_table_rows(results, sep):
+    """
+    Rows of the top 5 / bottom 5 flexibility table, one per cluster, with the metric names
+    and values of each cell joined by sep.
+    """
+    scores = _flex_long(results).set_index("metric").groupby("cluster", sort=False)["score"]
+    top_5 = scores.nlargest(5)
+    bottom_5 = scores.nsmallest(5)
+
+    table_data = []
+    for cluster in results.keys():
+        top_5_metrics = top_5.loc[cluster]
+        bottom_5_metrics = bottom_5.loc[cluster]
         table_data.append(
             [
                 f"Cluster {cluster}",
-                top_5_metrics_names,
-                top_5_metrics_values,
-                bottom_5_metrics_names,
-                bottom_5_metrics_values,
+                sep.join(top_5_metrics.index),
+                sep.join([f"{score:.2f}" for score in top_5_metrics.values]),
+                sep.join(bottom_5_metrics.index),
+                sep.join([f"{score:.2f}" for score in bottom_5_metrics.values]),
             ]
         )
+    return table_data
+
+
+def plot_flexibility_scores_table(results):
+    """
+    Function to plot a table showing the top 5 and bottom 5 flexibility scores for each cluster,
+    with separate columns for the metric names and values, and a title above the table.
+    """
+    # Prepare data for the table, with metric names and values on separate lines
+    table_data = _flexibility_table_rows(results, "\n")
 
     # Create a table figure with a larger height and width to fit the content
     fig, ax = plt.subplots(
@@ -81,19 +130,14 @@ def plot_flexibility_scores_table(results):
     ax.axis("off")
 
     # Define table headers and content
-    headers = [
-        "Cluster",
-        "Top 5 Flexible Metrics",
-        "Top 5 Flexibility Scores",
-        "Bottom 5 Strict Metrics",
-        "Bottom 5 Strict Scores",
-    ]
+    headers = FLEXIBILITY_TABLE_HEADERS
     table = ax.table(
         cellText=table_data, colLabels=headers, cellLoc="center", loc="center"
     )
 
     # Adjust the font size and layout for better visibility
-    table.auto_set_font_size(True)
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
 
     # Adjust column width to reduce the size of the 'Cluster' column
     table.auto_set_column_width([0, 1, 2, 3, 4])
@@ -106,19 +150,20 @@ def plot_flexibility_scores_table(results):
     ]  # Adjust column widths manually if needed
 
     # Set header row colors
-    for key, cell in table.get_celld().items():
-        row, col = key
-        if row == 0:  # Header row
-            cell.set_fontsize(12)
-            cell.set_text_props(weight="bold", color="white")
-            cell.set_facecolor("darkblue")
-            cell.set_edgecolor("white")
-        elif row % 2 == 0:  # Alternate row colors for visibility
-            cell.set_facecolor(mcolors.CSS4_COLORS["lightgrey"])
-
-    # Set font sizes for rows and adjust height for better readability of multi-line content
-    for row in table._cells:
-        table._cells[row].set_height(0.13)  # Adjust this value if necessary
+    for col in range(len(headers)):
+        table[0, col].set_fontsize(12)
+        table[0, col].set_text_props(weight="bold", color="white")
+        table[0, col].set_facecolor("darkblue")
+        table[0, col].set_edgecolor("white")
+
+    # Alternate row colors for visibility
+    for row in range(2, len(table_data) + 1, 2):
+        for col in range(len(headers)):
+            table[row, col].set_facecolor(mcolors.CSS4_COLORS["lightgrey"])
+
+    # Stretch all rows at once to a height of 0.13 for better readability of multi-line content
+    # (every cell starts at the same default height, so one scale factor sets them all)
+    table.scale(1, 0.13 / table[0, 0].get_height())  # Adjust this value if necessary
 
     # Adjust the layout to ensure the table fills the figure and moves the title higher
     plt.subplots_adjust(top=0.95)  # Move title higher
@@ -140,23 +185,12 @@ def save_flexibility_scores_to_csv(results, output_filename="flexibility_scores.
         results: Dictionary containing the flexibility scores for each cluster.
         output_filename: Name of the CSV file to save the results.
     """
-    # Prepare a list to store flexibility scores
-    data_to_save = []
-
-    # Iterate over each cluster's results
-    for cluster, result in results.items():
-        flexibility_score = result["flexibility_score"]
-
-        # Sort flexibility scores in decreasing order
-        sorted_scores = flexibility_score.sort_values(ascending=False)
-
-        # Add each score and corresponding metric to the list
-        for metric, score in sorted_scores.items():
-            data_to_save.append([cluster, metric, score])
-
-    # Convert the list to a DataFrame
-    flexibility_df = pd.DataFrame(
-        data_to_save, columns=["Cluster", "Metric", "Flexibility Score"]
+    # Sort all flexibility scores at once: by cluster, then by decreasing score
+    flexibility_df = (
+        _flex_long(results)
+        .sort_values(["cluster", "score"], ascending=[True, False])
+        .rename(columns={"cluster": "Cluster", "metric": "Metric", "score": "Flexibility Score"})
+        [["Cluster", "Metric", "Flexibility Score"]]
     )
 
     # Save the DataFrame to a CSV file
@@ -180,17 +214,15 @@ def plot_overall_flexibility(results):
     """
     Plot the overall leading metrics across all clusters based on flexibility score.
     """
-    # Gather all flexibility scores
-    combined_flexibility_scores = pd.Series(dtype=float)
-    for cluster, result in results.items():
-        combined_flexibility_scores = pd.concat(
-            [combined_flexibility_scores, result["flexibility_score"]]
-        )
+    # Gather all flexibility scores as one metric x cluster matrix
+    metrics, flexibility_matrix = _stack_by_index(
+        [result["flexibility_score"] for result in results.values()]
+    )
 
     # Calculate overall flexibility score across all clusters
-    overall_flexibility_score = combined_flexibility_scores.groupby(
-        combined_flexibility_scores.index
-    ).mean()
+    overall_flexibility_score = pd.Series(
+        np.nanmean(flexibility_matrix, axis=1), index=metrics
+    )
 
     # Get the top 5 and bottom 5 metrics across all clusters
     top_5_overall = overall_flexibility_score.nlargest(5)
@@ -235,20 +267,14 @@ def plot_overall_vif(results):
     """
     Function to plot the overall VIF (Variance Inflation Factor) across all clusters.
     """
-    # Gather all VIF data from each cluster
-    vif_df = pd.DataFrame()
-
-    for cluster, result in results.items():
-        vif_cluster = result["vif"]
-        vif_df = pd.concat([vif_df, vif_cluster.set_index("feature")], axis=1)
-
     # Calculate the mean VIF for each feature across all clusters
-    vif_mean = vif_df.mean(axis=1)
+    vif_mean = _overall_vif_mean(results)
 
     # Plot the overall VIF
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.bar(vif_mean.index, vif_mean, color="purple")
     ax.set_title("Overall (VIF) - how a metric is correlated to all others")
+    ax.set_xticks(np.arange(len(vif_mean.index)))
     ax.set_xticklabels(vif_mean.index, rotation=45, ha="right")
     plt.xlabel("Features")
     plt.ylabel("Mean VIF Across Clusters")
@@ -260,18 +286,16 @@ def plot_overall_metrics_influence(results):
     """
     Function to plot the overall metrics that influenced outliers the most across all clusters.
     """
-    # Gather metrics influence data from each cluster
-    metrics_influence_df = pd.DataFrame()
-
-    for cluster, result in results.items():
-        metrics_influence = result["metrics_influence"]
-        metrics_influence_df = pd.concat(
-            [metrics_influence_df, metrics_influence], axis=1
-        )
+    # Gather metrics influence data from each cluster as one metric x cluster matrix
+    metrics, influence_matrix = _stack_by_index(
+        [result["metrics_influence"] for result in results.values()]
+    )
 
     # Sum or average the influence scores for each metric across all clusters
     # You can either sum or average, depending on what makes sense for your analysis
-    overall_influence = metrics_influence_df.sum(axis=1)  # Summing across clusters
+    overall_influence = pd.Series(
+        np.nansum(influence_matrix, axis=1), index=metrics
+    )  # Summing across clusters
 
     # Plot the overall metrics that influenced outliers the most
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -297,19 +321,24 @@ def plot_cluster_similarity(silhouette_values, target, silhouette_avg):
     fig, ax1 = plt.subplots(1, 1, figsize=(10, 6))
     y_lower = 10
 
-    # Loop over each cluster to plot silhouette values
-    for i in np.unique(target):
-        ith_cluster_silhouette_values = silhouette_values[target == i]
-        ith_cluster_silhouette_values.sort()
-
-        size_cluster_i = ith_cluster_silhouette_values.shape[0]
+    # Sort once by (cluster, silhouette value) instead of masking and sorting per cluster
+    silhouette_values = np.asarray(silhouette_values)
+    labels, cluster_idx = np.unique(np.asarray(target), return_inverse=True)
+    order = np.lexsort((silhouette_values, cluster_idx))
+    sorted_values = silhouette_values[order]
+    counts = np.bincount(cluster_idx, minlength=len(labels))
+    offsets = np.concatenate(([0], counts.cumsum()))
+
+    # Loop over each cluster to plot its slice of the sorted silhouette values
+    for i, (lo, hi) in enumerate(zip(offsets[:-1], offsets[1:])):
+        size_cluster_i = counts[i]
         y_upper = y_lower + size_cluster_i
 
         ax1.fill_betweenx(
-            np.arange(y_lower, y_upper), 0, ith_cluster_silhouette_values, alpha=0.7
+            np.arange(y_lower, y_upper), 0, sorted_values[lo:hi], alpha=0.7
         )
 
-        ax1.text(-0.05, y_lower + 0.5 * size_cluster_i, str(i))
+        ax1.text(-0.05, y_lower + 0.5 * size_cluster_i, str(labels[i]))
 
         y_lower = y_upper + 10  # Add space between clusters
 
@@ -324,6 +353,76 @@ def plot_cluster_similarity(silhouette_values, target, silhouette_avg):
 #########################################streamlit#############################
 
 
+@st.cache_data(ttl=86400, show_spinner=False)
+def _tile_img(west, south, east, north, zoom, provider_name):
+    """
+    Download the basemap tiles covering the given web mercator bounds.
+    Cached for a day so reruns don't repeat the tile server round-trips.
+    """
+    # contextily pulls in rasterio/GDAL, so it is only imported once a basemap is actually drawn
+    import contextily as ctx
+
+    return ctx.bounds2img(
+        west, south, east, north, zoom=zoom, source=ctx.providers.query_name(provider_name)
+    )
+
+
+def add_cached_basemap(ax, crs, zoom="auto", provider_name="CartoDB.Positron"):
+    """
+    Drop-in replacement for ctx.add_basemap that draws cached tiles under the current axis limits of ax.
+    """
+    import contextily as ctx
+    from pyproj import Transformer
+
+    xmin, xmax, ymin, ymax = ax.axis()
+    west, south, east, north = Transformer.from_crs(
+        crs, "EPSG:3857", always_xy=True
+    ).transform_bounds(xmin, ymin, xmax, ymax)
+    img, extent = _tile_img(west, south, east, north, zoom, provider_name)
+    img, extent = ctx.warp_tiles(img, extent, t_crs=crs)
+    ax.imshow(img, extent=extent, interpolation="bilinear", zorder=0)
+    ax.axis((xmin, xmax, ymin, ymax))
+    # the tile providers' terms require their credit on the map, as ctx.add_basemap draws it
+    attribution = ctx.providers.query_name(provider_name).get("attribution")
+    if attribution:
+        ctx.add_attribution(ax, attribution)
+
+
+def _overall_vif_mean(results):
+    """
+    Mean VIF of each feature across all clusters.
+    """
+    features, vif_matrix = _stack_by_index(
+        [result["vif"].set_index("feature")["VIF"] for result in results.values()]
+    )
+
+    return pd.Series(np.nanmean(vif_matrix, axis=1), index=features)
+
+
+@st.cache_data(show_spinner=False)
+def _vif_png(features, values):
+    """
+    Render the overall VIF bar plot to PNG bytes. Keyed on the feature names and
+    mean VIF values, so reruns with the same results reuse the rendered image.
+    """
+    vif_mean = pd.Series(values, index=list(features))
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(vif_mean.index, vif_mean, color="purple")
+    ax.set_title("Overall (VIF) - how a metric is correlated to all others")
+    ax.set_xticks(np.arange(len(vif_mean.index)))
+    ax.set_xticklabels(vif_mean.index, rotation=45, ha="right")
+    ax.set_xlabel("Features")
+    ax.set_ylabel("Mean VIF Across Clusters")
+    fig.tight_layout()
+
+    # same rendering settings as st.pyplot
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", dpi=200)
+    plt.close(fig)
+    return buf.getvalue()
+
+
 def streamlit_plot_top_important_metrics(feature_importances, num_features=10):
     # Create a smaller figure and axis for plotting
     fig, ax = plt.subplots(figsize=(7, 5))  # Reduced figure size
@@ -343,6 +442,7 @@ def streamlit_plot_top_important_metrics(feature_importances, num_features=10):
         label.replace("_", " ")
         for label in feature_importances.head(num_features).index
     ]
+    ax.set_xticks(np.arange(len(labels)))
     ax.set_xticklabels(
         labels, rotation=45, ha="right", fontsize=9
     )  # Reduced font size for x-axis labels
@@ -359,40 +459,10 @@ def streamlit_plot_flexibility_scores_table(results):
     Function to display a table showing the top 5 and bottom 5 flexibility scores for each cluster
     in Streamlit.
     """
-    # Prepare data for the table
-    table_data = []
-
-    # Iterate over each cluster's results
-    for cluster, result in results.items():
-        flexibility_score = result["flexibility_score"]
-
-        # Get the top 5 and bottom 5 metrics by flexibility score
-        top_5_metrics = flexibility_score.nlargest(5)
-        bottom_5_metrics = flexibility_score.nsmallest(5)
-
-        # Add top 5 and bottom 5 metrics as separate columns for metric names and values
-        top_5_metrics_names = ", ".join(top_5_metrics.index)
-        top_5_metrics_values = ", ".join(
-            [f"{score:.2f}" for score in top_5_metrics.values]
-        )
-        bottom_5_metrics_names = ", ".join(bottom_5_metrics.index)
-        bottom_5_metrics_values = ", ".join(
-            [f"{score:.2f}" for score in bottom_5_metrics.values]
-        )
-
-        # Add the data to the table
-        table_data.append(
-            {
-                "Cluster": f"Cluster {cluster}",
-                "Top 5 Flexible Metrics": top_5_metrics_names,
-                "Top 5 Flexibility Scores": top_5_metrics_values,
-                "Bottom 5 Strict Metrics": bottom_5_metrics_names,
-                "Bottom 5 Strict Scores": bottom_5_metrics_values,
-            }
-        )
-
-    # Convert the table data to a DataFrame
-    df = pd.DataFrame(table_data)
+    # Prepare data for the table and convert it to a DataFrame
+    df = pd.DataFrame(
+        _flexibility_table_rows(results, ", "), columns=FLEXIBILITY_TABLE_HEADERS
+    )
 
     # Display the table in Streamlit
     st.write("### Top 5 and Bottom 5 Flexibility Scores for Each Cluster")
@@ -403,6 +473,8 @@ def streamlit_plot_outliers(gdf, results):
     """
     Function to plot the outliers from all clusters in different colors, adapted for Streamlit.
     """
+    import geopandas as gpd
+
     # Display message while plotting
     st.write("Plotting outliers...")
 
@@ -418,24 +490,27 @@ def streamlit_plot_outliers(gdf, results):
         cluster: colors[i % len(colors)] for i, cluster in enumerate(unique_clusters)
     }
 
-    # Create an empty GeoDataFrame to store outliers
-    all_outliers = gpd.GeoDataFrame()
-
-    # Collect all outliers for each cluster and combine them into one GeoDataFrame
-    for cluster in unique_clusters:
-        cluster_outliers = results[cluster]["outliers"]
-        # Add cluster label to each outlier for coloring purposes
-        cluster_outliers["cluster"] = cluster
-        all_outliers = pd.concat([all_outliers, cluster_outliers])
+    # Collect all outliers for each cluster, labelled with their cluster for coloring purposes,
+    # and combine them into one GeoDataFrame
+    all_outliers = gpd.GeoDataFrame(
+        pd.concat(
+            [results[cluster]["outliers"].assign(cluster=cluster) for cluster in unique_clusters],
+            ignore_index=True,
+        )
+    )
 
     # Ensure the outliers have the same CRS as the original gdf
     all_outliers = all_outliers.set_crs(gdf.crs, allow_override=True)
 
-    # Map colors to the 'cluster' column for outliers
-    outlier_colors = all_outliers["cluster"].map(color_map)
-
-    # Plot outliers colored by the custom color mapping
-    all_outliers.plot(color=outlier_colors, legend=False, ax=ax)
+    # Plot all outliers in one pass, colored by their 'cluster' column with the custom color mapping
+    all_outliers.plot(
+        ax=ax,
+        column="cluster",
+        categorical=True,
+        categories=unique_clusters,
+        cmap=mcolors.ListedColormap([color_map[cluster] for cluster in unique_clusters]),
+        legend=False,
+    )
 
     # Add title and customize plot
     ax.set_title("Outliers by Cluster", fontsize=16)
@@ -447,8 +522,8 @@ def streamlit_plot_outliers(gdf, results):
         for cluster in unique_clusters
     ]
 
-    # Add basemap using contextily
-    ctx.add_basemap(ax, crs=gdf.crs, source=ctx.providers.CartoDB.Positron)
+    # Add basemap using contextily, reusing the tiles fetched on previous reruns
+    add_cached_basemap(ax, gdf.crs)
 
     # Add the custom legend
     ax.legend(
@@ -463,31 +538,17 @@ def streamlit_plot_overall_vif(results):
     """
     Function to plot the overall VIF (Variance Inflation Factor) across all clusters, adapted for Streamlit.
     """
-    # Gather all VIF data from each cluster
-    vif_df = pd.DataFrame()
-
-    for cluster, result in results.items():
-        vif_cluster = result["vif"]
-        vif_df = pd.concat([vif_df, vif_cluster.set_index("feature")], axis=1)
-
     # Calculate the mean VIF for each feature across all clusters
-    vif_mean = vif_df.mean(axis=1)
+    vif_mean = _overall_vif_mean(results)
 
-    # Plot the overall VIF
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.bar(vif_mean.index, vif_mean, color="purple")
-    ax.set_title("Overall (VIF) - how a metric is correlated to all others")
-    ax.set_xticklabels(vif_mean.index, rotation=45, ha="right")
-    plt.xlabel("Features")
-    plt.ylabel("Mean VIF Across Clusters")
-    plt.tight_layout()
-
-    # Use Streamlit to display the plot
-    st.pyplot(fig)
+    # Use Streamlit to display the (cached) plot
+    st.image(_vif_png(tuple(vif_mean.index), tuple(vif_mean.values)), use_column_width=True)
 
 
 ####################################################unused#########################
 def plot_cluster_analysis(gdf, results, cluster_number):
+    import seaborn as sns
+
     # Get the numeric columns again
     numeric_columns = gdf.select_dtypes(include=[float, int]).columns
 
@@ -496,6 +557,7 @@ def plot_cluster_analysis(gdf, results, cluster_number):
     stats = results["basic_stats"]
     ax.bar(stats.index, stats["mean"], yerr=stats["variance"], capsize=5, color="blue")
     ax.set_title(f"Mean and Variance of Metrics for Cluster {cluster_number}")
+    ax.set_xticks(np.arange(len(stats.index)))
     ax.set_xticklabels(stats.index, rotation=45, ha="right")
     plt.show()
 
@@ -529,6 +591,7 @@ def plot_cluster_analysis(gdf, results, cluster_number):
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.bar(results["vif"]["feature"], results["vif"]["VIF"], color="purple")
     ax.set_title(f"Variance Inflation Factor (VIF) - Cluster {cluster_number}")
+    ax.set_xticks(np.arange(len(results["vif"]["feature"])))
     ax.set_xticklabels(results["vif"]["feature"], rotation=45, ha="right")
     plt.show()
 
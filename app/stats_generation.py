@@ -212,6 +212,7 @@ def plot_cluster_analysis(gdf, results, cluster_number):
     stats = results["basic_stats"]
     ax.bar(stats.index, stats["mean"], yerr=stats["variance"], capsize=5, color="blue")
     ax.set_title(f"Mean and Variance of Metrics for Cluster {cluster_number}")
+    ax.set_xticks(np.arange(len(stats.index)))
     ax.set_xticklabels(stats.index, rotation=45, ha="right")
     plt.show()
 
@@ -245,6 +246,7 @@ def plot_cluster_analysis(gdf, results, cluster_number):
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.bar(results["vif"]["feature"], results["vif"]["VIF"], color="purple")
     ax.set_title(f"Variance Inflation Factor (VIF) - Cluster {cluster_number}")
+    ax.set_xticks(np.arange(len(results["vif"]["feature"])))
     ax.set_xticklabels(results["vif"]["feature"], rotation=45, ha="right")
     plt.show()
 
@@ -282,6 +284,7 @@ def plot_cluster_analysis(gdf, results, cluster_number):
     pca_df = results["pca_components"].T
     pca_df.plot(kind="bar", ax=ax)
     ax.set_title(f"Leading Metrics by PCA Components for Cluster {cluster_number}")
+    ax.set_xticks(np.arange(len(pca_df.index)))
     ax.set_xticklabels(pca_df.index, rotation=45, ha="right")
     plt.show()
 
@@ -0,0 +1,51 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_blobs
+from generate_clusters import get_cluster, best_davies_bouldin_score, add_cluster_col
+
+
+@pytest.fixture(scope="module")
+def standardized():
+    X, _ = make_blobs(n_samples=600, n_features=4, centers=5, random_state=0)
+    # float32 like the standardized frame loaded from a ZIP
+    return pd.DataFrame(X, columns=[f"metric_{i}" for i in range(4)]).astype(np.float32)
+
+
+def _clustergram_ranking(gdf, model, min_clusters, max_clusters, n_init, random_state, repeat):
+    # the original Clustergram-based recommender
+    K = range(min_clusters, max_clusters)
+    best_scores = {k: 0 for k in K}
+    for i in range(repeat):
+        cgram = get_cluster(gdf, model, False, min_clusters, max_clusters, n_init, random_state)
+        davis_bouldin = cgram.davies_bouldin_score().iloc[:-1]
+        l = 0
+        for index, value in davis_bouldin.sort_values(ascending=False).items():
+            best_scores[index] += l
+            l += 1
+    return sorted(best_scores, key=lambda w: best_scores[w], reverse=True)
+
+
+@pytest.mark.parametrize("model", ["kmeans", "minibatchkmeans", "gmm", "hierarchical"])
+def test_best_davies_bouldin_score_matches_clustergram(standardized, model):
+    expected = _clustergram_ranking(standardized, model, 1, 8, 3, 42, 2)
+
+    X_arr = np.ascontiguousarray(standardized.to_numpy())
+    ranking = best_davies_bouldin_score(None, model=model, standardize=False, min_clusters=1, max_clusters=8,
+                                        n_init=3, random_state=42, repeat=2, X_arr=X_arr)
+
+    assert ranking == expected
+
+
+def test_add_cluster_col_hierarchical_matches_clustergram(standardized):
+    expected = get_cluster(standardized, 'hierarchical', min_clusters=4, max_clusters=5).labels[4].values
+
+    merged, buildings = pd.DataFrame(index=standardized.index), pd.DataFrame(index=standardized.index)
+    buildings, merged = add_cluster_col(merged, buildings, standardized, 4, 'hierarchical',
+                                        X_arr=np.ascontiguousarray(standardized.to_numpy()))
+
+    np.testing.assert_array_equal(merged["cluster"].values, expected)
+    np.testing.assert_array_equal(buildings["cluster"].values, expected)
@@ -0,0 +1,40 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import numpy as np
+import pandas as pd
+from plot_funcs import _flexibility_table_rows
+
+
+def _per_cluster_rows(results, sep):
+    # the original per-cluster nlargest/nsmallest loop
+    rows = []
+    for cluster, result in results.items():
+        top_5 = result["flexibility_score"].nlargest(5)
+        bottom_5 = result["flexibility_score"].nsmallest(5)
+        rows.append([
+            f"Cluster {cluster}",
+            sep.join(top_5.index),
+            sep.join([f"{score:.2f}" for score in top_5.values]),
+            sep.join(bottom_5.index),
+            sep.join([f"{score:.2f}" for score in bottom_5.values]),
+        ])
+    return rows
+
+
+def test_flexibility_table_rows_match_per_cluster_loop():
+    metrics = [f"metric_{i}" for i in range(7)]
+    partial = pd.Series(np.arange(7, dtype=float), index=metrics)
+    partial.iloc[[1, 4]] = np.nan
+    results = {
+        0: {"flexibility_score": pd.Series(np.arange(7, dtype=float), index=metrics)},
+        1: {"flexibility_score": pd.Series(np.nan, index=metrics)},
+        2: {"flexibility_score": partial},
+    }
+
+    rows = _flexibility_table_rows(results, ", ")
+
+    assert rows == _per_cluster_rows(results, ", ")
+    assert rows[0][1].split(", ") == ["metric_6", "metric_5", "metric_4", "metric_3", "metric_2"]
+    # all-NaN scores are kept, not dropped
+    assert rows[1][2] == "nan, nan, nan, nan, nan"